@@ -3,6 +3,19 @@ const std = @import("std");
 pub const NodeIndex = u32;
 pub const null_node: NodeIndex = std.math.maxInt(u32);
 
+/// Built-in standard library namespaces (`math.sqrt(x)`, `io.read_line()`, ...).
+/// They resolve without an import, so sema and codegen both consult this list.
+pub const StdlibNamespace = enum {
+    math,
+    str,
+    io,
+    os,
+
+    pub fn fromName(name: []const u8) ?StdlibNamespace {
+        return std.meta.stringToEnum(StdlibNamespace, name);
+    }
+};
+
 pub const Ast = struct {
     allocator: std.mem.Allocator,
     program: Program,
@@ -1,6 +1,8 @@
 const std = @import("std");
 const Ast = @import("ast.zig").Ast;
+const StdlibNamespace = @import("ast.zig").StdlibNamespace;
 const Diagnostics = @import("diagnostics.zig").Diagnostics;
+const LineIndex = @import("diagnostics.zig").LineIndex;
 const codegen_types = @import("codegen_types.zig");
 const codegen_stmts = @import("codegen_stmts.zig");
 const codegen_exprs = @import("codegen_exprs.zig");
@@ -56,6 +58,10 @@ pub const CodeGen = struct {
     // Trait vtable infrastructure
     trait_decls: std.StringHashMap(*const Ast.TraitDecl),
     vtable_globals: std.StringHashMap(c.LLVMValueRef), // "TraitName_TypeName" -> global vtable
+    // Constant string globals, keyed by contents (see internString)
+    string_globals: std.StringHashMap(c.LLVMValueRef),
+    // Function/extern name -> declared return type, for the module being generated
+    fn_return_types: std.StringHashMap(Ast.TypeExpr),
     // Global variables for argc/argv (set in main entry)
     argc_global: c.LLVMValueRef,
     argv_global: c.LLVMValueRef,
@@ -66,6 +72,7 @@ pub const CodeGen = struct {
     di_compile_unit: ?c.LLVMMetadataRef = null,
     source: []const u8 = "",
     source_path: []const u8 = "",
+    line_index: ?LineIndex = null,
     // Stdlib C function refs
     sqrt_fn: c.LLVMValueRef,
     pow_fn: c.LLVMValueRef,
@@ -402,6 +409,8 @@ pub const CodeGen = struct {
             .generic_fn_decls = std.StringHashMap(*const Ast.FnDecl).init(allocator),
             .trait_decls = std.StringHashMap(*const Ast.TraitDecl).init(allocator),
             .vtable_globals = std.StringHashMap(c.LLVMValueRef).init(allocator),
+            .string_globals = std.StringHashMap(c.LLVMValueRef).init(allocator),
+            .fn_return_types = std.StringHashMap(Ast.TypeExpr).init(allocator),
         };
     }
 
@@ -409,6 +418,9 @@ pub const CodeGen = struct {
         self.debug_enabled = true;
         self.source = source;
         self.source_path = source_path;
+        // Every statement asks for its line; index the source once instead of
+        // rescanning from the start each time (falls back to scanning on OOM).
+        self.line_index = LineIndex.init(self.allocator, source) catch null;
 
         self.di_builder = c.LLVMCreateDIBuilder(self.module);
 
@@ -463,7 +475,21 @@ pub const CodeGen = struct {
         );
     }
 
+    /// Pointer to a constant global holding `bytes`. Every use of the same
+    /// string in the module shares one global instead of emitting a copy per
+    /// occurrence; `name` only labels the global the first time it's created.
+    pub fn internString(self: *CodeGen, bytes: []const u8, name: [*:0]const u8) GenError!c.LLVMValueRef {
+        if (self.string_globals.get(bytes)) |global| return global;
+        const bytes_z = self.allocator.dupeZ(u8, bytes) catch return error.CodeGenError;
+        defer self.allocator.free(bytes_z);
+        const global = c.LLVMBuildGlobalStringPtr(self.builder, bytes_z.ptr, name);
+        const key = self.allocator.dupe(u8, bytes) catch return global;
+        self.string_globals.put(key, global) catch self.allocator.free(key);
+        return global;
+    }
+
     pub fn getLineFromOffset(self: *const CodeGen, byte_offset: u32) u32 {
+        if (self.line_index) |*index| return index.getLineAndColumn(byte_offset).line;
         var line: u32 = 1;
         const end = @min(byte_offset, @as(u32, @intCast(self.source.len)));
         for (self.source[0..end]) |ch| {
@@ -490,10 +516,7 @@ pub const CodeGen = struct {
     }
 
     pub fn isStdlibNamespace(name: []const u8) bool {
-        return std.mem.eql(u8, name, "math") or
-            std.mem.eql(u8, name, "str") or
-            std.mem.eql(u8, name, "io") or
-            std.mem.eql(u8, name, "os");
+        return StdlibNamespace.fromName(name) != null;
     }
 
     pub fn deinit(self: *CodeGen) void {
@@ -527,15 +550,25 @@ pub const CodeGen = struct {
         self.generic_fn_decls.deinit();
         self.trait_decls.deinit();
         self.vtable_globals.deinit();
+        var sit = self.string_globals.keyIterator();
+        while (sit.next()) |key| {
+            self.allocator.free(key.*);
+        }
+        self.string_globals.deinit();
+        self.fn_return_types.deinit();
+        if (self.line_index) |*index| index.deinit(self.allocator);
     }
 
     pub fn generate(self: *CodeGen) GenError!void {
-        // Pre-pass: register type aliases
+        // Pre-pass: register type aliases and function return types
+        self.fn_return_types.clearRetainingCapacity();
         for (self.ast.program.decls.items) |decl| {
             switch (decl.decl) {
                 .type_alias => |ta| {
                     self.type_aliases.put(ta.name, ta.target) catch {};
                 },
+                .function => |fn_decl| try self.fn_return_types.put(fn_decl.name, fn_decl.return_type),
+                .extern_decl => |ed| try self.fn_return_types.put(ed.name, ed.return_type),
                 else => {},
             }
         }
@@ -612,11 +645,12 @@ pub const CodeGen = struct {
                     const method_count = td.methods.items.len;
 
                     // Build vtable struct type: { fn_ptr, fn_ptr, ... }
-                    var vtable_field_types = std.ArrayList(c.LLVMTypeRef){};
+                    // Both lists get exactly one entry per trait method, so size them up front.
+                    var vtable_field_types = try std.ArrayList(c.LLVMTypeRef).initCapacity(self.allocator, method_count);
                     defer vtable_field_types.deinit(self.allocator);
 
                     // Build vtable function type and wrapper for each trait method
-                    var vtable_values = std.ArrayList(c.LLVMValueRef){};
+                    var vtable_values = try std.ArrayList(c.LLVMValueRef).initCapacity(self.allocator, method_count);
                     defer vtable_values.deinit(self.allocator);
 
                     for (td.methods.items) |trait_method| {
@@ -624,15 +658,15 @@ pub const CodeGen = struct {
                         const ret_tag = self.resolveTypeExpr(trait_method.return_type);
                         const ret_llvm = self.typeTagToLLVM(ret_tag);
 
-                        var wrapper_param_types = std.ArrayList(c.LLVMTypeRef){};
+                        var wrapper_param_types = try std.ArrayList(c.LLVMTypeRef).initCapacity(self.allocator, trait_method.params.items.len + 1);
                         defer wrapper_param_types.deinit(self.allocator);
-                        wrapper_param_types.append(self.allocator, i8ptr_ty) catch {}; // self as i8*
+                        wrapper_param_types.appendAssumeCapacity(i8ptr_ty); // self as i8*
                         for (trait_method.params.items) |param| {
                             const pt = self.resolveTypeExpr(param.type_expr);
-                            wrapper_param_types.append(self.allocator, self.typeTagToLLVM(pt)) catch {};
+                            wrapper_param_types.appendAssumeCapacity(self.typeTagToLLVM(pt));
                         }
                         const wrapper_fn_type = c.LLVMFunctionType(ret_llvm, wrapper_param_types.items.ptr, @intCast(wrapper_param_types.items.len), 0);
-                        vtable_field_types.append(self.allocator, c.LLVMPointerType(wrapper_fn_type, 0)) catch {};
+                        vtable_field_types.appendAssumeCapacity(c.LLVMPointerType(wrapper_fn_type, 0));
 
                         // Generate wrapper function
                         const wrapper_name = std.fmt.allocPrint(self.allocator, "__vtable_{s}_{s}_{s}", .{ trait_name, type_name, trait_method.name }) catch return error.CodeGenError;
@@ -662,12 +696,12 @@ pub const CodeGen = struct {
                         };
 
                         // Call real method with loaded self + forwarded params
-                        var call_args = std.ArrayList(c.LLVMValueRef){};
+                        var call_args = try std.ArrayList(c.LLVMValueRef).initCapacity(self.allocator, wrapper_param_types.items.len);
                         defer call_args.deinit(self.allocator);
-                        call_args.append(self.allocator, loaded_self) catch {};
+                        call_args.appendAssumeCapacity(loaded_self);
                         var pi: u32 = 1;
                         while (pi < @as(u32, @intCast(wrapper_param_types.items.len))) : (pi += 1) {
-                            call_args.append(self.allocator, c.LLVMGetParam(wrapper_fn, pi)) catch {};
+                            call_args.appendAssumeCapacity(c.LLVMGetParam(wrapper_fn, pi));
                         }
 
                         const real_fn_type = c.LLVMGlobalGetValueType(real_fn);
@@ -681,7 +715,7 @@ pub const CodeGen = struct {
                         }
 
                         c.LLVMPositionBuilderAtEnd(self.builder, saved_block);
-                        vtable_values.append(self.allocator, wrapper_fn) catch {};
+                        vtable_values.appendAssumeCapacity(wrapper_fn);
                     }
 
                     // Create vtable struct type
@@ -715,11 +749,16 @@ pub const CodeGen = struct {
         self.ast = imported_ast;
         defer self.ast = saved_ast;
 
-        // Pass 1: Register type aliases from imported module
+        // Pass 1: Register public type aliases, and the return types of all of the
+        // module's functions (its bodies may call private ones)
+        self.fn_return_types.clearRetainingCapacity();
         for (imported_ast.program.decls.items) |decl| {
-            if (decl.visibility != .public) continue;
             switch (decl.decl) {
-                .type_alias => |ta| { self.type_aliases.put(ta.name, ta.target) catch {}; },
+                .function => |fn_decl| try self.fn_return_types.put(fn_decl.name, fn_decl.return_type),
+                .extern_decl => |ed| try self.fn_return_types.put(ed.name, ed.return_type),
+                .type_alias => |ta| if (decl.visibility == .public) {
+                    self.type_aliases.put(ta.name, ta.target) catch {};
+                },
                 else => {},
             }
         }
@@ -1022,21 +1061,25 @@ pub const CodeGen = struct {
         };
     }
 
+    /// Primitive type names usable as conversion functions, e.g. `i64(x)`.
+    const type_conversions = std.StaticStringMap(TypeTag).initComptime(.{
+        .{ "i8", .i8_type },
+        .{ "i16", .i16_type },
+        .{ "i32", .i32_type },
+        .{ "i64", .i64_type },
+        .{ "i128", .i128_type },
+        .{ "u8", .u8_type },
+        .{ "u16", .u16_type },
+        .{ "u32", .u32_type },
+        .{ "u64", .u64_type },
+        .{ "u128", .u128_type },
+        .{ "f64", .f64_type },
+        .{ "bool", .bool_type },
+        .{ "char", .char_type },
+    });
+
     pub fn getTypeConversion(_: *const CodeGen, name: []const u8) ?TypeTag {
-        if (std.mem.eql(u8, name, "i8")) return .i8_type;
-        if (std.mem.eql(u8, name, "i16")) return .i16_type;
-        if (std.mem.eql(u8, name, "i32")) return .i32_type;
-        if (std.mem.eql(u8, name, "i64")) return .i64_type;
-        if (std.mem.eql(u8, name, "i128")) return .i128_type;
-        if (std.mem.eql(u8, name, "u8")) return .u8_type;
-        if (std.mem.eql(u8, name, "u16")) return .u16_type;
-        if (std.mem.eql(u8, name, "u32")) return .u32_type;
-        if (std.mem.eql(u8, name, "u64")) return .u64_type;
-        if (std.mem.eql(u8, name, "u128")) return .u128_type;
-        if (std.mem.eql(u8, name, "f64")) return .f64_type;
-        if (std.mem.eql(u8, name, "bool")) return .bool_type;
-        if (std.mem.eql(u8, name, "char")) return .char_type;
-        return null;
+        return type_conversions.get(name);
     }
 
     fn intBitWidth(tag: TypeTag) ?u32 {
@@ -35,10 +35,8 @@ pub fn genExpr(self: *CodeGen, expr_idx: Ast.ExprIndex) CodeGen.GenError!CodeGen
             };
         },
         .string_literal => |val| {
-            const str_z = self.allocator.dupeZ(u8, val) catch return error.CodeGenError;
-            defer self.allocator.free(str_z);
             return .{
-                .value = c.LLVMBuildGlobalStringPtr(self.builder, str_z.ptr, "str"),
+                .value = try self.internString(val, "str"),
                 .type_tag = .string_type,
             };
         },
@@ -576,13 +574,13 @@ pub fn genMethodCall(self: *CodeGen, mc: Ast.MethodCallExpr) CodeGen.GenError!Co
     }
 
     // Build args: self (the object) + method args
-    var args = std.ArrayList(c.LLVMValueRef){};
+    var args = try std.ArrayList(c.LLVMValueRef).initCapacity(self.allocator, mc.args.items.len + 1);
     defer args.deinit(self.allocator);
-    try args.append(self.allocator, obj.value); // self parameter
+    args.appendAssumeCapacity(obj.value); // self parameter
 
     for (mc.args.items) |arg_idx| {
         const arg_val = try genExpr(self, arg_idx);
-        try args.append(self.allocator, arg_val.value);
+        args.appendAssumeCapacity(arg_val.value);
     }
 
     const fn_type = c.LLVMGlobalGetValueType(function);
@@ -610,11 +608,11 @@ pub fn genImportCall(self: *CodeGen, func_name: []const u8, call_args: *const st
         return error.CodeGenError;
     }
 
-    var args = std.ArrayList(c.LLVMValueRef){};
+    var args = try std.ArrayList(c.LLVMValueRef).initCapacity(self.allocator, call_args.items.len);
     defer args.deinit(self.allocator);
     for (call_args.items) |arg_idx| {
         const arg_val = try genExpr(self, arg_idx);
-        try args.append(self.allocator, arg_val.value);
+        args.appendAssumeCapacity(arg_val.value);
     }
 
     const fn_type = c.LLVMGlobalGetValueType(function);
@@ -646,12 +644,12 @@ pub fn genAssociatedCall(self: *CodeGen, ac: Ast.AssociatedCallExpr) CodeGen.Gen
     }
 
     // Build args (no self parameter for associated functions)
-    var args = std.ArrayList(c.LLVMValueRef){};
+    var args = try std.ArrayList(c.LLVMValueRef).initCapacity(self.allocator, ac.args.items.len);
     defer args.deinit(self.allocator);
 
     for (ac.args.items) |arg_idx| {
         const arg_val = try genExpr(self, arg_idx);
-        try args.append(self.allocator, arg_val.value);
+        args.appendAssumeCapacity(arg_val.value);
     }
 
     const fn_type = c.LLVMGlobalGetValueType(function);
@@ -838,8 +836,9 @@ pub fn genCallExpr(self: *CodeGen, call_expr: Ast.CallExpr) CodeGen.GenError!Cod
         switch (decl.decl) {
             .function => |fn_decl| {
                 if (std.mem.eql(u8, fn_decl.name, name)) {
+                    try param_type_tags.ensureTotalCapacity(self.allocator, fn_decl.params.items.len);
                     for (fn_decl.params.items) |param| {
-                        param_type_tags.append(self.allocator, self.resolveTypeExpr(param.type_expr)) catch {};
+                        param_type_tags.appendAssumeCapacity(self.resolveTypeExpr(param.type_expr));
                     }
                     break;
                 }
@@ -848,7 +847,7 @@ pub fn genCallExpr(self: *CodeGen, call_expr: Ast.CallExpr) CodeGen.GenError!Cod
         }
     }
 
-    var args = std.ArrayList(c.LLVMValueRef){};
+    var args = try std.ArrayList(c.LLVMValueRef).initCapacity(self.allocator, call_expr.args.items.len);
     defer args.deinit(self.allocator);
     for (call_expr.args.items, 0..) |arg_idx, arg_i| {
         const arg_val = try genExpr(self, arg_idx);
@@ -857,13 +856,13 @@ pub fn genCallExpr(self: *CodeGen, call_expr: Ast.CallExpr) CodeGen.GenError!Cod
             switch (param_type_tags.items[arg_i]) {
                 .trait_type => |trait_name| {
                     const upcast_val = try codegen_hof.buildTraitUpcast(self, arg_val, arg_idx, trait_name);
-                    try args.append(self.allocator, upcast_val);
+                    args.appendAssumeCapacity(upcast_val);
                     continue;
                 },
                 else => {},
             }
         }
-        try args.append(self.allocator, arg_val.value);
+        args.appendAssumeCapacity(arg_val.value);
     }
 
     const fn_type = c.LLVMGlobalGetValueType(function);
@@ -1070,7 +1069,7 @@ pub fn genStringConcat(self: *CodeGen, lhs_val: c.LLVMValueRef, rhs_val: c.LLVMV
     const buf = c.LLVMBuildCall2(self.builder, malloc_type, self.malloc_fn, @constCast(&malloc_args), 1, "concat_buf");
 
     // sprintf(buf, "%s%s", lhs, rhs)
-    const fmt_str = c.LLVMBuildGlobalStringPtr(self.builder, "%s%s", "concat_fmt");
+    const fmt_str = try self.internString("%s%s", "concat_fmt");
     const sprintf_args = [_]c.LLVMValueRef{ buf, fmt_str, lhs_val, rhs_val };
     _ = c.LLVMBuildCall2(self.builder, sprintf_type, self.sprintf_fn, @constCast(&sprintf_args), 4, "");
 
@@ -1088,20 +1087,6 @@ pub fn genSizeOf(self: *CodeGen, type_expr: Ast.TypeExpr) CodeGen.GenError!CodeG
 }
 
 pub fn lookupFunctionReturnType(self: *CodeGen, name: []const u8) CodeGen.TypeTag {
-    for (self.ast.program.decls.items) |decl| {
-        switch (decl.decl) {
-            .function => |fn_decl| {
-                if (std.mem.eql(u8, fn_decl.name, name)) {
-                    return self.resolveTypeExpr(fn_decl.return_type);
-                }
-            },
-            .extern_decl => |ed| {
-                if (std.mem.eql(u8, ed.name, name)) {
-                    return self.resolveTypeExpr(ed.return_type);
-                }
-            },
-            else => {},
-        }
-    }
-    return .i32_type;
+    const ret = self.fn_return_types.get(name) orelse return .i32_type;
+    return self.resolveTypeExpr(ret);
 }
@@ -1,5 +1,6 @@
 const std = @import("std");
 const Ast = @import("ast.zig").Ast;
+const StdlibNamespace = @import("ast.zig").StdlibNamespace;
 const codegen_mod = @import("codegen.zig");
 const CodeGen = codegen_mod.CodeGen;
 const c = codegen_mod.c;
@@ -33,17 +34,16 @@ fn intFmtAndVal(self: *CodeGen, arg: CodeGen.ExprResult, with_newline: bool) str
 }
 
 pub fn genStdlibCall(self: *CodeGen, namespace: []const u8, func: []const u8, args: *const std.ArrayList(Ast.ExprIndex)) CodeGen.GenError!CodeGen.ExprResult {
-    if (std.mem.eql(u8, namespace, "math")) {
-        return genMathCall(self, func, args);
-    } else if (std.mem.eql(u8, namespace, "str")) {
-        return genStrCall(self, func, args);
-    } else if (std.mem.eql(u8, namespace, "io")) {
-        return genIoCall(self, func, args);
-    } else if (std.mem.eql(u8, namespace, "os")) {
-        return genOsCall(self, func, args);
-    }
-    self.diagnostics.report(.@"error", 0, "unknown stdlib namespace '{s}'", .{namespace});
-    return error.CodeGenError;
+    const ns = StdlibNamespace.fromName(namespace) orelse {
+        self.diagnostics.report(.@"error", 0, "unknown stdlib namespace '{s}'", .{namespace});
+        return error.CodeGenError;
+    };
+    return switch (ns) {
+        .math => genMathCall(self, func, args),
+        .str => genStrCall(self, func, args),
+        .io => genIoCall(self, func, args),
+        .os => genOsCall(self, func, args),
+    };
 }
 
 pub fn genMathConstant(self: *CodeGen, field: []const u8) CodeGen.GenError!CodeGen.ExprResult {
@@ -768,8 +768,8 @@ pub fn genIoCall(self: *CodeGen, func: []const u8, args: *const std.ArrayList(As
             .string_type => self.fmt_str_raw,
             .char_type => self.fmt_char_raw,
             .bool_type => return blk: {
-                const true_str = c.LLVMBuildGlobalStringPtr(self.builder, "true", "true_no_nl");
-                const false_str = c.LLVMBuildGlobalStringPtr(self.builder, "false", "false_no_nl");
+                const true_str = try self.internString("true", "true_no_nl");
+                const false_str = try self.internString("false", "false_no_nl");
                 const fmt_sel = c.LLVMBuildSelect(self.builder, arg.value, true_str, false_str, "bool_fmt");
                 var print_args = [_]c.LLVMValueRef{fmt_sel};
                 _ = c.LLVMBuildCall2(self.builder, printf_fn_type, self.printf_fn, &print_args, 1, "");
@@ -843,7 +843,7 @@ pub fn genOsCall(self: *CodeGen, func: []const u8, args: *const std.ArrayList(As
         // If null, return empty string
         const null_ptr = c.LLVMConstNull(c.LLVMPointerType(c.LLVMInt8TypeInContext(self.context), 0));
         const is_null = c.LLVMBuildICmp(self.builder, c.LLVMIntEQ, result, null_ptr, "is_null");
-        const empty_str = c.LLVMBuildGlobalStringPtr(self.builder, "", "empty_str");
+        const empty_str = try self.internString("", "empty_str");
         const final_val = c.LLVMBuildSelect(self.builder, is_null, empty_str, result, "env_val");
         return .{ .value = final_val, .type_tag = .string_type };
     } else if (std.mem.eql(u8, func, "clock")) {
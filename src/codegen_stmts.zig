@@ -17,19 +17,19 @@ pub fn genFunctionWithName(self: *CodeGen, fn_decl: *const Ast.FnDecl, llvm_name
     else
         self.typeTagToLLVM(return_type_tag);
 
-    var param_types = std.ArrayList(c.LLVMTypeRef){};
+    var param_types = try std.ArrayList(c.LLVMTypeRef).initCapacity(self.allocator, fn_decl.params.items.len + 2);
     defer param_types.deinit(self.allocator);
 
     // Main gets argc/argv params for C ABI
     if (is_main) {
-        try param_types.append(self.allocator, c.LLVMInt32TypeInContext(self.context)); // argc
+        param_types.appendAssumeCapacity(c.LLVMInt32TypeInContext(self.context)); // argc
         const i8ptr = c.LLVMPointerType(c.LLVMInt8TypeInContext(self.context), 0);
-        try param_types.append(self.allocator, c.LLVMPointerType(i8ptr, 0)); // argv: char**
+        param_types.appendAssumeCapacity(c.LLVMPointerType(i8ptr, 0)); // argv: char**
     }
 
     for (fn_decl.params.items) |param| {
         const pt = self.resolveTypeExpr(param.type_expr);
-        try param_types.append(self.allocator, self.typeTagToLLVM(pt));
+        param_types.appendAssumeCapacity(self.typeTagToLLVM(pt));
     }
 
     const fn_type = c.LLVMFunctionType(llvm_return_type, param_types.items.ptr, @intCast(param_types.items.len), 0);
@@ -322,18 +322,18 @@ pub fn genMethod(self: *CodeGen, type_name: []const u8, method: *const Ast.Metho
     const return_type_tag = self.resolveTypeExpr(method.return_type);
     const llvm_return_type = self.typeTagToLLVM(return_type_tag);
 
-    var param_types = std.ArrayList(c.LLVMTypeRef){};
+    var param_types = try std.ArrayList(c.LLVMTypeRef).initCapacity(self.allocator, method.params.items.len + 1);
     defer param_types.deinit(self.allocator);
 
     // If method has self, first param is the struct type
     if (method.has_self) {
         const self_type = CodeGen.TypeTag{ .struct_type = type_name };
-        try param_types.append(self.allocator, self.typeTagToLLVM(self_type));
+        param_types.appendAssumeCapacity(self.typeTagToLLVM(self_type));
     }
 
     for (method.params.items) |param| {
         const pt = self.resolveTypeExpr(param.type_expr);
-        try param_types.append(self.allocator, self.typeTagToLLVM(pt));
+        param_types.appendAssumeCapacity(self.typeTagToLLVM(pt));
     }
 
     const fn_type = c.LLVMFunctionType(llvm_return_type, param_types.items.ptr, @intCast(param_types.items.len), 0);
@@ -403,11 +403,11 @@ pub fn genExternDecl(self: *CodeGen, ed: *const Ast.ExternDecl) CodeGen.GenError
     const return_type_tag = self.resolveTypeExpr(ed.return_type);
     const llvm_return_type = self.typeTagToLLVM(return_type_tag);
 
-    var param_types = std.ArrayList(c.LLVMTypeRef){};
+    var param_types = try std.ArrayList(c.LLVMTypeRef).initCapacity(self.allocator, ed.params.items.len);
     defer param_types.deinit(self.allocator);
     for (ed.params.items) |param| {
         const pt = self.resolveTypeExpr(param.type_expr);
-        try param_types.append(self.allocator, self.typeTagToLLVM(pt));
+        param_types.appendAssumeCapacity(self.typeTagToLLVM(pt));
     }
 
     const fn_type = c.LLVMFunctionType(llvm_return_type, param_types.items.ptr, @intCast(param_types.items.len), 0);
@@ -27,7 +27,10 @@ pub fn init(allocator: std.mem.Allocator) void {
         };
         defer file.close();
         const writer = file.deprecatedWriter();
-        writer.print("[package]\nname = \"{s}\"\nversion = \"0.1.0\"\n\n[dependencies]\n", .{dir_name}) catch {};
+        writer.print("[package]\nname = \"{s}\"\nversion = \"0.1.0\"\n\n[dependencies]\n", .{dir_name}) catch |err| {
+            writeErr("error: could not write asthra.toml: {}\n", .{err});
+            std.process.exit(1);
+        };
         writeOut("Created asthra.toml\n", .{});
         return;
     };
@@ -97,17 +100,12 @@ pub fn add(allocator: std.mem.Allocator, args: []const []const u8) void {
         std.process.exit(1);
     };
     defer file.close();
-    const writer = file.deprecatedWriter();
 
-    // Write existing content
-    writer.writeAll(existing) catch {};
-
-    // Append new dependency
-    if (tag != null) {
-        writer.print("{s} = {{ git = \"{s}\", tag = \"{s}\" }}\n", .{ dep_name, git_url, tag.? }) catch {};
-    } else {
-        writer.print("{s} = {{ git = \"{s}\", commit = \"{s}\" }}\n", .{ dep_name, git_url, commit.? }) catch {};
-    }
+    // The file was just truncated, so a failed write here loses the manifest — don't ignore it
+    writeManifestWithDependency(file, existing, dep_name, git_url, tag, commit.?) catch |err| {
+        writeErr("error: could not write asthra.toml: {}\n", .{err});
+        std.process.exit(1);
+    };
 
     writeOut("Added dependency: {s}\n", .{dep_name});
 
@@ -123,6 +121,20 @@ pub fn add(allocator: std.mem.Allocator, args: []const []const u8) void {
     updateLockfile(allocator, git_url, dep_name, commit.?, tag);
 }
 
+fn writeManifestWithDependency(file: std.fs.File, existing: []const u8, dep_name: []const u8, git_url: []const u8, tag: ?[]const u8, commit: []const u8) !void {
+    const writer = file.deprecatedWriter();
+
+    // Write existing content
+    try writer.writeAll(existing);
+
+    // Append new dependency
+    if (tag) |t| {
+        try writer.print("{s} = {{ git = \"{s}\", tag = \"{s}\" }}\n", .{ dep_name, git_url, t });
+    } else {
+        try writer.print("{s} = {{ git = \"{s}\", commit = \"{s}\" }}\n", .{ dep_name, git_url, commit });
+    }
+}
+
 /// `asthra install` — fetch all dependencies from asthra.toml
 pub fn install(allocator: std.mem.Allocator) void {
     var manifest = package.PackageManifest.parseFromFile(allocator, "asthra.toml") catch {
@@ -147,20 +159,11 @@ pub fn install(allocator: std.mem.Allocator) void {
     defer new_lockfile.deinit();
 
     for (manifest.dependencies.items) |dep| {
-        // Check lockfile for existing resolution
-        var resolved_commit: []const u8 = undefined;
+        // Check lockfile for an existing resolution that still matches the spec
         const resolved_tag: ?[]const u8 = dep.tag;
         var needs_free = false;
-
-        if (lockfile) |lf| {
-            if (lf.findByGitUrl(dep.git_url)) |resolved| {
-                resolved_commit = resolved.commit;
-            } else {
-                resolved_commit = resolveCommit(allocator, dep, &needs_free);
-            }
-        } else {
-            resolved_commit = resolveCommit(allocator, dep, &needs_free);
-        }
+        const resolved_commit = pinnedCommit(if (lockfile) |*lf| lf else null, dep) orelse
+            resolveCommit(allocator, dep, &needs_free);
 
         // Fetch
         const cache_path = fetcher.fetchPackage(allocator, dep.git_url, resolved_commit) catch {
@@ -182,16 +185,21 @@ pub fn install(allocator: std.mem.Allocator) void {
     }
 
     // Resolve transitive dependencies (BFS)
-    resolveTransitiveDeps(allocator, &new_lockfile);
+    resolveTransitiveDeps(allocator, &new_lockfile, if (lockfile) |*lf| lf else null);
 
     // Write lockfile
-    new_lockfile.writeToFile("asthra.lock") catch {
-        writeErr("error: could not write asthra.lock\n", .{});
+    new_lockfile.writeToFile("asthra.lock") catch |err| {
+        writeErr("error: could not write asthra.lock: {}\n", .{err});
+        std.process.exit(1);
     };
     writeOut("Wrote asthra.lock\n", .{});
 }
 
-fn resolveTransitiveDeps(allocator: std.mem.Allocator, lockfile: *package.Lockfile) void {
+/// Breadth-first walk of the fetched packages' manifests, appending every
+/// dependency not already in `lockfile`. Commits pinned in `previous` (the
+/// lockfile on disk before this install) are reused when they still match the
+/// dependency's tag, so an unchanged tree needs no tag lookups against the remotes.
+fn resolveTransitiveDeps(allocator: std.mem.Allocator, lockfile: *package.Lockfile, previous: ?*const package.Lockfile) void {
     // Track visited git URLs to prevent cycles and duplicates
     var visited = std.StringHashMap(void).init(allocator);
     defer visited.deinit();
@@ -223,9 +231,9 @@ fn resolveTransitiveDeps(allocator: std.mem.Allocator, lockfile: *package.Lockfi
             if (visited.contains(dep.git_url)) continue;
             visited.put(dep.git_url, {}) catch {};
 
-            // Resolve commit
+            // Resolve commit, preferring the one already pinned in the old lockfile
             var needs_free = false;
-            const resolved_commit = resolveCommit(allocator, dep, &needs_free);
+            const resolved_commit = pinnedCommit(previous, dep) orelse resolveCommit(allocator, dep, &needs_free);
             const resolved_tag: ?[]const u8 = dep.tag;
 
             // Fetch
@@ -249,6 +257,23 @@ fn resolveTransitiveDeps(allocator: std.mem.Allocator, lockfile: *package.Lockfi
     }
 }
 
+/// Whether a lockfile entry still answers what `dep` asks for. Only tag specs
+/// are reused: an explicit commit costs nothing to honor, and the lockfile
+/// doesn't record which version a range resolved to, so ranges are re-resolved.
+fn pinMatches(pinned: package.ResolvedDep, dep: package.Dependency) bool {
+    if (dep.commit != null or dep.version != null) return false;
+    const dep_tag = dep.tag orelse return false;
+    const pinned_tag = pinned.tag orelse return false;
+    return std.mem.eql(u8, pinned_tag, dep_tag);
+}
+
+/// Commit pinned for `dep` in `lockfile`, if the entry still matches its spec.
+fn pinnedCommit(lockfile: ?*const package.Lockfile, dep: package.Dependency) ?[]const u8 {
+    const lf = lockfile orelse return null;
+    const pinned = lf.findByGitUrl(dep.git_url) orelse return null;
+    return if (pinMatches(pinned, dep)) pinned.commit else null;
+}
+
 fn resolveCommit(allocator: std.mem.Allocator, dep: package.Dependency, needs_free: *bool) []const u8 {
     if (dep.commit) |c| {
         needs_free.* = false;
@@ -293,12 +318,74 @@ fn updateLockfile(allocator: std.mem.Allocator, git_url: []const u8, name: []con
         .tag = if (tag) |t| (allocator.dupe(u8, t) catch return) else null,
     }) catch {};
 
-    lockfile.writeToFile("asthra.lock") catch {};
+    lockfile.writeToFile("asthra.lock") catch |err| {
+        writeErr("error: could not write asthra.lock: {}\n", .{err});
+        std.process.exit(1);
+    };
 }
 
+/// Last path segment of a git path: "github.com/user/repo" -> "repo".
+/// Tolerates a trailing slash and a ".git" suffix.
 pub fn extractRepoName(git_url: []const u8) []const u8 {
-    if (std.mem.lastIndexOf(u8, git_url, "/")) |last_slash| {
-        return git_url[last_slash + 1 ..];
+    const trimmed = std.mem.trimRight(u8, git_url, "/");
+    const name = if (std.mem.lastIndexOfScalar(u8, trimmed, '/')) |last_slash|
+        trimmed[last_slash + 1 ..]
+    else
+        trimmed;
+    if (name.len > 4 and std.mem.endsWith(u8, name, ".git")) {
+        return name[0 .. name.len - 4];
     }
-    return git_url;
+    return name;
+}
+
+// ── Tests ──────────────────────────────────────────────────────────────────
+
+const testing = std.testing;
+
+test "extract repo name" {
+    try testing.expectEqualStrings("mathutils", extractRepoName("github.com/user/mathutils"));
+    try testing.expectEqualStrings("mathutils", extractRepoName("github.com/user/mathutils/"));
+    try testing.expectEqualStrings("mathutils", extractRepoName("github.com/user/mathutils.git"));
+    try testing.expectEqualStrings("logger", extractRepoName("logger"));
+}
+
+test "pinned commit is reused only for an unchanged tag" {
+    const pinned = package.ResolvedDep{ .name = "lib", .git_url = "github.com/user/lib", .commit = "aaaa", .tag = "v1.0.0" };
+    const base = package.Dependency{ .name = "lib", .git_url = "github.com/user/lib", .tag = "v1.0.0", .commit = null, .version = null };
+    try testing.expect(pinMatches(pinned, base));
+
+    var retagged = base;
+    retagged.tag = "v2.0.0";
+    try testing.expect(!pinMatches(pinned, retagged));
+
+    var explicit = base;
+    explicit.tag = null;
+    explicit.commit = "bbbb";
+    try testing.expect(!pinMatches(pinned, explicit));
+
+    var ranged = base;
+    ranged.tag = null;
+    ranged.version = "^1.0.0";
+    try testing.expect(!pinMatches(pinned, ranged));
+}
+
+test "pinnedCommit consults the lockfile entry for the dependency's URL" {
+    var lockfile = package.Lockfile{
+        .packages = std.ArrayList(package.ResolvedDep){},
+        .allocator = testing.allocator,
+    };
+    defer lockfile.packages.deinit(testing.allocator);
+    try lockfile.packages.append(testing.allocator, .{ .name = "lib", .git_url = "github.com/user/lib", .commit = "aaaa", .tag = "v1.0.0" });
+
+    const dep = package.Dependency{ .name = "lib", .git_url = "github.com/user/lib", .tag = "v1.0.0", .commit = null, .version = null };
+    try testing.expectEqualStrings("aaaa", pinnedCommit(&lockfile, dep).?);
+    try testing.expect(pinnedCommit(null, dep) == null);
+
+    var retagged = dep;
+    retagged.tag = "v2.0.0";
+    try testing.expect(pinnedCommit(&lockfile, retagged) == null);
+
+    var other = dep;
+    other.git_url = "github.com/user/other";
+    try testing.expect(pinnedCommit(&lockfile, other) == null);
 }
@@ -20,8 +20,65 @@ pub const Diagnostic = struct {
     message: []const u8,
 };
 
+pub const Location = struct {
+    line: u32,
+    column: u32,
+};
+
+/// Byte offset of the first character of every line, built in one pass so
+/// that offset -> line/column lookups are a binary search instead of a
+/// rescan from the start of the source.
+pub const LineIndex = struct {
+    source: []const u8,
+    starts: []const u32,
+
+    pub fn init(allocator: std.mem.Allocator, source: []const u8) !LineIndex {
+        var starts = std.ArrayList(u32){};
+        errdefer starts.deinit(allocator);
+        try starts.append(allocator, 0);
+        for (source, 0..) |ch, i| {
+            if (ch == '\n') try starts.append(allocator, @intCast(i + 1));
+        }
+        return .{ .source = source, .starts = try starts.toOwnedSlice(allocator) };
+    }
+
+    pub fn deinit(self: *LineIndex, allocator: std.mem.Allocator) void {
+        allocator.free(self.starts);
+    }
+
+    /// Zero-based index of the line containing `byte_offset` (clamped to the end of source).
+    fn lineIndexOf(self: *const LineIndex, byte_offset: u32) usize {
+        const offset = @min(byte_offset, @as(u32, @intCast(self.source.len)));
+        // Find the last line start <= offset
+        var lo: usize = 0;
+        var hi: usize = self.starts.len;
+        while (hi - lo > 1) {
+            const mid = lo + (hi - lo) / 2;
+            if (self.starts[mid] <= offset) lo = mid else hi = mid;
+        }
+        return lo;
+    }
+
+    pub fn getLineAndColumn(self: *const LineIndex, byte_offset: u32) Location {
+        const idx = self.lineIndexOf(byte_offset);
+        const offset = @min(byte_offset, @as(u32, @intCast(self.source.len)));
+        return .{ .line = @intCast(idx + 1), .column = offset - self.starts[idx] + 1 };
+    }
+
+    /// Extract the source line containing the given byte offset.
+    pub fn getSourceLine(self: *const LineIndex, byte_offset: u32) ?[]const u8 {
+        if (byte_offset >= self.source.len) return null;
+        const idx = self.lineIndexOf(byte_offset);
+        const line_end = if (idx + 1 < self.starts.len) self.starts[idx + 1] - 1 else self.source.len;
+        return self.source[self.starts[idx]..line_end];
+    }
+};
+
 pub const Diagnostics = struct {
     errors: std.ArrayList(Diagnostic) = .{},
+    /// Number of `.error`-severity entries in `errors`, kept by `report` so
+    /// `hasErrors` doesn't rescan the list after every compiler stage.
+    error_count: u32 = 0,
     allocator: std.mem.Allocator,
     source: []const u8,
     filename: []const u8,
@@ -49,21 +106,42 @@ pub const Diagnostics = struct {
             .message = message,
         }) catch {
             self.allocator.free(message);
+            return;
         };
+        if (severity == .@"error") self.error_count += 1;
     }
 
-    pub fn hasErrors(self: *const Diagnostics) bool {
-        for (self.errors.items) |err| {
-            if (err.severity == .@"error") return true;
+    /// Drop every diagnostic reported after the first `count`, keeping
+    /// `error_count` in step. Used by the parser to undo speculative parses.
+    pub fn truncate(self: *Diagnostics, count: usize) void {
+        for (self.errors.items[count..]) |err| {
+            if (err.severity == .@"error") self.error_count -= 1;
+            self.allocator.free(err.message);
         }
-        return false;
+        self.errors.shrinkRetainingCapacity(count);
+    }
+
+    pub fn hasErrors(self: *const Diagnostics) bool {
+        return self.error_count > 0;
     }
 
     pub fn printAll(self: *const Diagnostics) void {
-        const file = std.fs.File.stderr();
-        const writer = file.deprecatedWriter();
+        // Buffer the report and flush once at the end — stderr is unbuffered,
+        // so writing directly costs one write(2) per print call. Streaming mode,
+        // because a positional writer would start at offset 0 and overwrite
+        // earlier output when stderr is redirected to a file.
+        var buffer: [4096]u8 = undefined;
+        var file_writer = std.fs.File.stderr().writerStreaming(&buffer);
+        const writer = &file_writer.interface;
+        defer writer.flush() catch {};
+
+        // One line table for the whole report instead of rescanning the
+        // source per diagnostic; fall back to scanning if allocation fails.
+        var line_index: ?LineIndex = LineIndex.init(self.allocator, self.source) catch null;
+        defer if (line_index) |*index| index.deinit(self.allocator);
+
         for (self.errors.items) |err| {
-            const loc = self.getLineAndColumn(err.start);
+            const loc = if (line_index) |*index| index.getLineAndColumn(err.start) else self.getLineAndColumn(err.start);
             writer.print("{s}:{d}:{d}: {s}: {s}\n", .{
                 self.filename,
                 loc.line,
@@ -73,14 +151,17 @@ pub const Diagnostics = struct {
             }) catch {};
 
             // Print source context: the offending line and a caret pointing to the error
-            if (self.getSourceLine(err.start)) |line_info| {
-                writer.print("{s}\n", .{line_info.line}) catch {};
+            const source_line = if (line_index) |*index|
+                index.getSourceLine(err.start)
+            else if (self.getSourceLine(err.start)) |line_info|
+                line_info.line
+            else
+                null;
+            if (source_line) |line| {
+                writer.print("{s}\n", .{line}) catch {};
                 // Print spaces up to the column, then a caret
-                var col: u32 = 1;
-                while (col < loc.column) : (col += 1) {
-                    writer.print(" ", .{}) catch {};
-                }
-                writer.print("^\n", .{}) catch {};
+                writer.splatByteAll(' ', loc.column - 1) catch {};
+                writer.writeAll("^\n") catch {};
             }
         }
     }
@@ -104,7 +185,7 @@ pub const Diagnostics = struct {
         return .{ .line = self.source[line_start..line_end] };
     }
 
-    pub fn getLineAndColumn(self: *const Diagnostics, byte_offset: u32) struct { line: u32, column: u32 } {
+    pub fn getLineAndColumn(self: *const Diagnostics, byte_offset: u32) Location {
         var line: u32 = 1;
         var col: u32 = 1;
         const end = @min(byte_offset, @as(u32, @intCast(self.source.len)));
@@ -172,6 +253,29 @@ test "warnings do not count as errors" {
     try testing.expect(!diag.hasErrors());
 }
 
+test "error_count tracks only errors" {
+    var diag = Diagnostics.init(testing.allocator, "test", "test.ast");
+    defer diag.deinit();
+    diag.report(.note, 0, "a note", .{});
+    diag.report(.@"error", 0, "first", .{});
+    diag.report(.warning, 0, "a warning", .{});
+    diag.report(.@"error", 0, "second", .{});
+    try testing.expectEqual(@as(u32, 2), diag.error_count);
+    try testing.expectEqual(@as(usize, 4), diag.errors.items.len);
+}
+
+test "truncate drops trailing diagnostics and their errors" {
+    var diag = Diagnostics.init(testing.allocator, "test", "test.ast");
+    defer diag.deinit();
+    diag.report(.warning, 0, "kept", .{});
+    diag.report(.@"error", 0, "dropped", .{});
+    diag.report(.note, 0, "dropped too", .{});
+    diag.truncate(1);
+    try testing.expect(!diag.hasErrors());
+    try testing.expectEqual(@as(usize, 1), diag.errors.items.len);
+    try testing.expectEqualStrings("kept", diag.errors.items[0].message);
+}
+
 test "severity labels" {
     try testing.expectEqualStrings("error", Severity.@"error".label());
     try testing.expectEqualStrings("warning", Severity.warning.label());
@@ -197,3 +301,29 @@ test "getSourceLine returns null for out of bounds" {
     defer diag.deinit();
     try testing.expect(diag.getSourceLine(100) == null);
 }
+
+test "LineIndex matches getLineAndColumn" {
+    const source = "a\nbc\n\ndef\n";
+    var diag = Diagnostics.init(testing.allocator, source, "test.ast");
+    defer diag.deinit();
+    var index = try LineIndex.init(testing.allocator, source);
+    defer index.deinit(testing.allocator);
+
+    var offset: u32 = 0;
+    while (offset <= source.len + 2) : (offset += 1) {
+        const expected = diag.getLineAndColumn(offset);
+        const actual = index.getLineAndColumn(offset);
+        try testing.expectEqual(expected.line, actual.line);
+        try testing.expectEqual(expected.column, actual.column);
+    }
+}
+
+test "LineIndex getSourceLine" {
+    var index = try LineIndex.init(testing.allocator, "hello\nworld\nfoo");
+    defer index.deinit(testing.allocator);
+    try testing.expectEqualStrings("hello", index.getSourceLine(0).?);
+    try testing.expectEqualStrings("hello", index.getSourceLine(5).?);
+    try testing.expectEqualStrings("world", index.getSourceLine(6).?);
+    try testing.expectEqualStrings("foo", index.getSourceLine(14).?);
+    try testing.expect(index.getSourceLine(100) == null);
+}
@@ -204,6 +204,7 @@ const ImportedModule = struct {
     package_name: []const u8,
     ast: *Ast,
     source: []const u8,
+    file_path: []const u8,
 };
 
 fn resolveImports(gpa: std.mem.Allocator, ast_allocator: std.mem.Allocator, ast: *Ast, diagnostics: *Diagnostics, source_path: []const u8, imported_modules: *std.ArrayList(ImportedModule), manifest: ?pkg.PackageManifest, lockfile: ?pkg.Lockfile) !void {
@@ -253,6 +254,15 @@ fn resolveImports(gpa: std.mem.Allocator, ast_allocator: std.mem.Allocator, ast:
 }
 
 fn resolveAndRegisterImport(gpa: std.mem.Allocator, ast_allocator: std.mem.Allocator, ast: *Ast, diagnostics: *Diagnostics, file_path: []const u8, alias: []const u8, imported_modules: *std.ArrayList(ImportedModule)) !void {
+    // A file imported more than once (e.g. under two aliases) is read, parsed and
+    // generated once; later imports only register their alias.
+    for (imported_modules.items) |mod| {
+        if (std.mem.eql(u8, mod.file_path, file_path)) {
+            try ast.program.import_aliases.put(alias, mod.package_name);
+            return;
+        }
+    }
+
     const import_source = std.fs.cwd().readFileAlloc(ast_allocator, file_path, 1024 * 1024) catch |err| {
         diagnostics.report(.@"error", 0, "cannot read imported file '{s}': {}", .{ file_path, err });
         return;
@@ -280,5 +290,6 @@ fn resolveAndRegisterImport(gpa: std.mem.Allocator, ast_allocator: std.mem.Alloc
         .package_name = package_name,
         .ast = import_ast,
         .source = import_source,
+        .file_path = try ast_allocator.dupe(u8, file_path),
     });
 }
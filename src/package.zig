@@ -171,22 +171,32 @@ pub const Lockfile = struct {
         return lockfile;
     }
 
+    // One format string per entry shape, so each package is a single print
+    const package_fmt = "[[package]]\nname = \"{s}\"\ngit = \"{s}\"\ncommit = \"{s}\"\n";
+    const package_entry_fmt = package_fmt ++ "\n";
+    const tagged_package_entry_fmt = package_fmt ++ "tag = \"{s}\"\n\n";
+
     pub fn writeToFile(self: *const Lockfile, path: []const u8) !void {
         const file = try std.fs.cwd().createFile(path, .{});
         defer file.close();
-        const writer = file.deprecatedWriter();
+        // Buffered so the whole lockfile goes out in a handful of writes
+        var buffer: [4096]u8 = undefined;
+        var file_writer = file.writer(&buffer);
+        // The interface only reports error.WriteFailed; the underlying file
+        // error (NoSpaceLeft, InputOutput, ...) is kept on the File.Writer.
+        self.writeEntries(&file_writer.interface) catch return file_writer.err orelse error.WriteFailed;
+    }
 
+    fn writeEntries(self: *const Lockfile, writer: *std.Io.Writer) std.Io.Writer.Error!void {
         try writer.writeAll("# Auto-generated by asthra. Do not edit.\n\n");
         for (self.packages.items) |pkg| {
-            try writer.writeAll("[[package]]\n");
-            try writer.print("name = \"{s}\"\n", .{pkg.name});
-            try writer.print("git = \"{s}\"\n", .{pkg.git_url});
-            try writer.print("commit = \"{s}\"\n", .{pkg.commit});
             if (pkg.tag) |tag| {
-                try writer.print("tag = \"{s}\"\n", .{tag});
+                try writer.print(tagged_package_entry_fmt, .{ pkg.name, pkg.git_url, pkg.commit, tag });
+            } else {
+                try writer.print(package_entry_fmt, .{ pkg.name, pkg.git_url, pkg.commit });
             }
-            try writer.writeAll("\n");
         }
+        try writer.flush();
     }
 
     pub fn findByGitUrl(self: *const Lockfile, url: []const u8) ?ResolvedDep {
@@ -920,10 +920,7 @@ pub const Parser = struct {
 
     pub fn restoreDiagnostics(self: *Parser, saved_count: usize) void {
         // Free and remove diagnostics added during speculative parsing
-        for (self.diagnostics.errors.items[saved_count..]) |err| {
-            self.diagnostics.allocator.free(err.message);
-        }
-        self.diagnostics.errors.items.len = saved_count;
+        self.diagnostics.truncate(saved_count);
     }
 
     // Helpers
@@ -403,6 +403,13 @@ test "parse tuple element access" {
     }
 }
 
+test "less-than comparison leaves no errors after generic literal backtracking" {
+    var result = try testParse("package main;\npub fn main() -> void { let x: i32 = 5; if x < 10 { return; } return; }");
+    defer result.diag.deinit();
+    try testing.expect(!result.diag.hasErrors());
+    try testing.expectEqual(@as(usize, 0), result.diag.errors.items.len);
+}
+
 test "parse grouped expression still works" {
     var result = try testParse("package main;\npub fn main() -> void { let x: i32 = (1 + 2); return; }");
     defer result.diag.deinit();
@@ -1,7 +1,14 @@
 const std = @import("std");
 const Ast = @import("ast.zig").Ast;
+const StdlibNamespace = @import("ast.zig").StdlibNamespace;
 const Diagnostics = @import("diagnostics.zig").Diagnostics;
 
+/// Well-known type names that resolve without a declaration.
+const builtin_type_names = std.StaticStringMap(void).initComptime(.{
+    .{"Option"},
+    .{"Result"},
+});
+
 pub const SemanticAnalyzer = struct {
     allocator: std.mem.Allocator,
     ast: *const Ast,
@@ -317,12 +324,11 @@ pub const SemanticAnalyzer = struct {
 
     fn checkAssign(self: *SemanticAnalyzer, assign: Ast.AssignStmt) void {
         // Look up the target variable
-        if (self.lookupSymbol(assign.target)) |info| {
+        if (self.useSymbol(assign.target)) |info| {
             if (!info.is_mutable) {
                 self.diagnostics.report(.@"error", assign.start, "cannot assign to immutable variable '{s}'", .{assign.target});
                 self.error_count += 1;
             }
-            self.markUsed(assign.target);
         } else {
             self.reportErrorWithName(assign.start, "undefined variable", assign.target);
         }
@@ -342,23 +348,16 @@ pub const SemanticAnalyzer = struct {
         switch (expr) {
             .identifier => |name| {
                 // Look up the identifier
-                if (self.lookupSymbol(name)) |_| {
-                    self.markUsed(name);
-                } else {
+                if (self.useSymbol(name) == null) {
                     // Don't report error if it's a known struct, enum, const, type alias, or import alias
                     if (self.struct_names.contains(name)) return;
                     if (self.enum_names.contains(name)) return;
                     if (self.const_names.contains(name)) return;
                     if (self.type_aliases.contains(name)) return;
                     if (self.import_aliases.contains(name)) return;
-                    // Also allow well-known type names: Option, Result
-                    if (std.mem.eql(u8, name, "Option")) return;
-                    if (std.mem.eql(u8, name, "Result")) return;
-                    // Allow stdlib namespace identifiers
-                    if (std.mem.eql(u8, name, "math")) return;
-                    if (std.mem.eql(u8, name, "str")) return;
-                    if (std.mem.eql(u8, name, "io")) return;
-                    if (std.mem.eql(u8, name, "os")) return;
+                    // Also allow well-known type names and stdlib namespace identifiers
+                    if (builtin_type_names.has(name)) return;
+                    if (StdlibNamespace.fromName(name) != null) return;
                     self.reportErrorWithName(0, "undefined variable", name);
                 }
             },
@@ -468,9 +467,7 @@ pub const SemanticAnalyzer = struct {
         switch (callee_expr) {
             .identifier => |name| {
                 // Mark as used
-                if (self.lookupSymbol(name)) |_| {
-                    self.markUsed(name);
-                }
+                _ = self.useSymbol(name);
 
                 if (self.functions.get(name)) |sig| {
                     const arg_count: u32 = @intCast(call.args.items.len);
@@ -566,27 +563,18 @@ pub const SemanticAnalyzer = struct {
         current.symbols.put(name, info) catch {};
     }
 
-    fn lookupSymbol(self: *SemanticAnalyzer, name: []const u8) ?SymbolInfo {
+    /// Resolve `name` against the scope stack and mark it used, in one walk.
+    fn useSymbol(self: *SemanticAnalyzer, name: []const u8) ?SymbolInfo {
         // Walk from top of scope stack to bottom
-        var i: usize = self.scopes.items.len;
-        while (i > 0) {
-            i -= 1;
-            if (self.scopes.items[i].symbols.get(name)) |info| {
-                return info;
-            }
-        }
-        return null;
-    }
-
-    fn markUsed(self: *SemanticAnalyzer, name: []const u8) void {
         var i: usize = self.scopes.items.len;
         while (i > 0) {
             i -= 1;
             if (self.scopes.items[i].symbols.getPtr(name)) |info| {
                 info.is_used = true;
-                return;
+                return info.*;
             }
         }
+        return null;
     }
 
     fn reportError(self: *SemanticAnalyzer, start: u32, comptime msg: []const u8) void {